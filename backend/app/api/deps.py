@@ -0,0 +1,8 @@
+# app/api/deps.py
+import httpx
+from fastapi import Request
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Return the shared HTTP client created in the app lifespan"""
+    return request.app.state.http
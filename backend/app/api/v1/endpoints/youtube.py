@@ -1,20 +1,118 @@
 # app/api/v1/endpoints/youtube.py
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, field_validator, Field
+import asyncio
+import html
+from xml.etree import ElementTree
+import httpx
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator, model_validator, Field
 from typing import Optional, List
-import re
-from urllib.parse import urlparse
-from datetime import datetime
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api.formatters import TextFormatter
+from urllib.parse import urlsplit
+from datetime import datetime, timezone
+from cachetools import TTLCache
+import youtube_transcript_api
+from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound
+from app.api.deps import get_http_client
+from app.core.config import settings
+from app.core.rate_limit import AsyncRateLimiter
 
 
 router = APIRouter()
 
+# Hosts accepted by the URL validator
+_VALID_DOMAINS = frozenset({
+    'youtube.com', 'www.youtube.com',
+    'youtu.be', 'www.youtu.be',
+    'm.youtube.com'
+})
+
+# Every accepted URL starts with one of these; since each ends right after the
+# host, matching a prefix is the whole domain check and no parse is needed
+_YT_PREFIXES = tuple(
+    f'{scheme}{domain}/'
+    for scheme in ('https://', 'http://')
+    for domain in sorted(_VALID_DOMAINS)
+)
+_YT_PREFIX_MAX_LEN = max(len(prefix) for prefix in _YT_PREFIXES)
+
+# Path prefixes on youtube.com that carry the video ID as the next segment
+_VIDEO_ID_PATH_PREFIXES = ('/embed/', '/v/')
+
+# Transcript languages tried, in order, when the requested one isn't available
+_FALLBACK_LANGUAGES = ('en',)
+
+# Caption track endpoint; returns XML for the requested language in one round-trip
+_TIMEDTEXT_URL = "https://www.youtube.com/api/timedtext"
+
+# Caps concurrent calls to YouTube so parallel requests don't get the server throttled
+_TRANSCRIPT_SEM = asyncio.Semaphore(settings.TRANSCRIPT_MAX_CONCURRENCY)
+
+# Raised when YouTube answers 429; youtube-transcript-api 1.0 replaced
+# TooManyRequests with IpBlocked. Other RequestBlocked errors mean the IP is
+# blocked outright, so they are not retried
+_THROTTLED_ERROR = (
+    getattr(youtube_transcript_api, "TooManyRequests", None)
+    or youtube_transcript_api.IpBlocked
+)
+
+# youtube-transcript-api 1.x lists transcripts through an instance (the static
+# list_transcripts was removed in 1.2); older releases only have the static method
+_list_transcripts = (
+    YouTubeTranscriptApi().list
+    if hasattr(YouTubeTranscriptApi, "list")
+    else YouTubeTranscriptApi.list_transcripts
+)
+
+# Spaces out requests to youtube.com on top of the concurrency cap
+_YOUTUBE_LIMITER = AsyncRateLimiter(
+    (settings.YOUTUBE_RATE_LIMIT_PER_SECOND, 1),
+    (settings.YOUTUBE_RATE_LIMIT_PER_MINUTE, 60)
+)
+
+# Transcript results keyed by (video_id, language); failures are kept for a
+# shorter time so retries of a broken video don't hit YouTube every time
+_TRANSCRIPT_CACHE = TTLCache(
+    maxsize=settings.TRANSCRIPT_CACHE_SIZE,
+    ttl=settings.TRANSCRIPT_CACHE_TTL_SECONDS
+)
+_TRANSCRIPT_ERROR_CACHE = TTLCache(
+    maxsize=settings.TRANSCRIPT_CACHE_SIZE,
+    ttl=settings.TRANSCRIPT_ERROR_CACHE_TTL_SECONDS
+)
+
+# Lookups currently running, keyed like the caches, so concurrent requests for
+# the same video (e.g. a repeated URL in a batch) share one YouTube fetch
+_TRANSCRIPT_IN_FLIGHT = {}
+
+# Static response for /supported-formats, serialized once at import
+SUPPORTED_FORMATS = {
+    "supported_formats": [
+        "https://www.youtube.com/watch?v=VIDEO_ID",
+        "https://youtube.com/watch?v=VIDEO_ID",
+        "https://youtu.be/VIDEO_ID",
+        "https://www.youtube.com/embed/VIDEO_ID",
+        "https://m.youtube.com/watch?v=VIDEO_ID"
+    ],
+    "domains": [
+        "youtube.com",
+        "www.youtube.com",
+        "youtu.be",
+        "m.youtube.com"
+    ]
+}
+_SUPPORTED_FORMATS_BYTES = orjson.dumps(SUPPORTED_FORMATS)
+
 # Pydantic models
 class YouTubeURLRequest(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+    
     url: str = Field(..., description="YouTube video URL")
     language: str = Field(default='en', description="Preferred transcript language (e.g., 'en', 'es', 'fr')")
+    video_id: Optional[str] = Field(
+        default=None,
+        description="Video ID extracted from the URL during validation",
+        json_schema_extra={"readOnly": True}
+    )
     
     @field_validator('url')
     @classmethod
@@ -22,27 +120,38 @@ class YouTubeURLRequest(BaseModel):
         if not v:
             raise ValueError('URL cannot be empty')
         
-        # Parse the URL
-        parsed_url = urlparse(v)
-        
-        # Check if domain is YouTube
-        valid_domains = [
-            'youtube.com', 'www.youtube.com', 
-            'youtu.be', 'www.youtu.be',
-            'm.youtube.com'
-        ]
-        
-        if parsed_url.netloc.lower() not in valid_domains:
+        # Check if domain is YouTube; scheme and host are case-insensitive
+        if not v[:_YT_PREFIX_MAX_LEN].lower().startswith(_YT_PREFIXES):
             raise ValueError('URL must be from YouTube domain (youtube.com or youtu.be)')
-        
-        # Extract video ID to validate it's a valid YouTube URL format
-        video_id = extract_video_id(v)
-        if not video_id:
-            raise ValueError('Invalid YouTube URL format')
             
         return v
+    
+    @model_validator(mode='after')
+    def set_video_id(self):
+        # Extract video ID once so the endpoint doesn't have to parse the URL again
+        video_id = extract_video_id(self.url)
+        if not video_id:
+            raise ValueError('Invalid YouTube URL format')
+        
+        self.video_id = video_id
+        return self
+
+class YouTubeBatchRequest(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+    
+    urls: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.BATCH_MAX_URLS,
+        description="YouTube video URLs"
+    )
+    language: str = Field(default='en', description="Preferred transcript language (e.g., 'en', 'es', 'fr')")
 
+# Response models are built from trusted data with model_construct, so they
+# are frozen to keep them immutable once created
 class YouTubeVideoInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     video_id: str
     title: Optional[str] = None
     description: Optional[str] = None
@@ -52,57 +161,190 @@ class YouTubeVideoInfo(BaseModel):
     channel_name: Optional[str] = None
     transcript: Optional[str] = None
     transcript_language: Optional[str] = None
+    # None when the transcript came from a path that doesn't list every track
     available_languages: Optional[List[str]] = None
     processed_at: datetime
 
 class YouTubeResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     success: bool
     message: str
     data: Optional[YouTubeVideoInfo] = None
     error: Optional[str] = None
 
+class YouTubeBatchResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
+    success: bool
+    message: str
+    results: List[YouTubeResponse]
+
+def _extract_v(query: str) -> Optional[str]:
+    """Return the value of the first `v` query parameter without building a full dict"""
+    for part in query.split('&'):
+        if part.startswith('v='):
+            return part[2:]
+    return None
+
 # Helper function to extract video ID from YouTube URL
 def extract_video_id(url: str) -> Optional[str]:
     """Extract video ID from various YouTube URL formats"""
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
-        r'youtube\.com\/v\/([^&\n?#]+)',
-    ]
+    parsed_url = urlsplit(url)
+    path = parsed_url.path
     
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
+    if parsed_url.netloc.lower().endswith('youtu.be'):
+        # https://youtu.be/VIDEO_ID
+        video_id = path[1:].split('/', 1)[0]
+    elif path == '/watch':
+        # https://www.youtube.com/watch?v=VIDEO_ID
+        video_id = _extract_v(parsed_url.query)
+    elif path.startswith(_VIDEO_ID_PATH_PREFIXES):
+        # https://www.youtube.com/embed/VIDEO_ID, https://www.youtube.com/v/VIDEO_ID
+        video_id = path.split('/', 3)[2]
+    else:
+        video_id = None
     
-    return None
+    return video_id or None
+
+async def get_video_transcript(
+    video_id: str,
+    language: str = 'en',
+    client: Optional[httpx.AsyncClient] = None
+) -> dict:
+    """
+    Get transcript for a YouTube video, served from the in-process cache when possible
+    """
+    key = (video_id, language)
+    
+    cached = _TRANSCRIPT_CACHE.get(key) or _TRANSCRIPT_ERROR_CACHE.get(key)
+    if cached is not None:
+        return cached
+    
+    task = _TRANSCRIPT_IN_FLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(load_video_transcript(video_id, language, client))
+        _TRANSCRIPT_IN_FLIGHT[key] = task
+        task.add_done_callback(lambda _: _TRANSCRIPT_IN_FLIGHT.pop(key, None))
+    
+    # Shielded so one caller disconnecting doesn't cancel the fetch for the others
+    return await asyncio.shield(task)
+
+async def load_video_transcript(
+    video_id: str,
+    language: str = 'en',
+    client: Optional[httpx.AsyncClient] = None
+) -> dict:
+    """
+    Fetch transcript for a YouTube video and store the result in the cache
+    """
+    key = (video_id, language)
+    
+    result = None
+    if client is not None:
+        result = await fetch_timedtext_transcript(client, video_id, language)
+    if result is None:
+        result = await fetch_video_transcript(video_id, language)
+    
+    if result["success"]:
+        _TRANSCRIPT_CACHE[key] = result
+    else:
+        _TRANSCRIPT_ERROR_CACHE[key] = result
+    
+    return result
+
+async def fetch_timedtext_transcript(
+    client: httpx.AsyncClient,
+    video_id: str,
+    language: str = 'en'
+) -> Optional[dict]:
+    """
+    Fetch transcript directly from YouTube's timedtext endpoint
+    Returns None when no caption track is served so the caller can fall back
+    to youtube-transcript-api. available_languages is None in the result since
+    this endpoint doesn't list the other tracks
+    """
+    # Any failure here falls back to the youtube-transcript-api path, so this
+    # can never do worse than that path alone
+    try:
+        async with _TRANSCRIPT_SEM:
+            await _YOUTUBE_LIMITER.acquire()
+            response = await client.get(
+                _TIMEDTEXT_URL,
+                params={"lang": language, "v": video_id}
+            )
+        
+        if response.status_code != 200 or not response.content:
+            return None
+        
+        root = ElementTree.fromstring(response.content)
+        
+        # Caption text is HTML-escaped inside the XML
+        segments = [html.unescape(element.text) for element in root.iter("text") if element.text]
+    except Exception:
+        return None
+    
+    if not segments:
+        return None
+    
+    return {
+        "transcript": "\n".join(segments),
+        "language": language,
+        # timedtext only serves the requested track, so the full language list is unknown
+        "available_languages": None,
+        "success": True
+    }
 
-async def get_video_transcript(video_id: str, language: str = 'en') -> dict:
+async def call_transcript_api(func, *args):
+    """
+    Run a blocking youtube-transcript-api call in a worker thread
+    Calls hold a concurrency slot, are rate limited, and are retried with
+    exponential backoff when YouTube answers 429. The slot is released while
+    backing off so a throttled request doesn't starve the others
+    """
+    for attempt in range(settings.TRANSCRIPT_MAX_RETRIES):
+        try:
+            async with _TRANSCRIPT_SEM:
+                await _YOUTUBE_LIMITER.acquire()
+                return await asyncio.to_thread(func, *args)
+        except _THROTTLED_ERROR:
+            if attempt == settings.TRANSCRIPT_MAX_RETRIES - 1:
+                raise
+        await asyncio.sleep(2 ** attempt)
+
+async def fetch_video_transcript(video_id: str, language: str = 'en') -> dict:
     """
     Extract transcript from YouTube video using youtube-transcript-api
     """
     try:
+        # youtube-transcript-api is synchronous, so its network calls run in a
+        # worker thread (see call_transcript_api) to keep the event loop free.
         # Get available transcripts
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        transcript_list = await call_transcript_api(_list_transcripts, video_id)
         
         # Get available languages
         available_languages = []
         for transcript in transcript_list:
             available_languages.append(transcript.language_code)
         
-        # Try to get transcript in requested language, fallback to first available
+        # Try the requested language, then the fallback languages; find_transcript
+        # prefers manually created transcripts over generated ones
         try:
-            transcript = transcript_list.find_transcript([language])
-        except:
-            # If requested language not available, get the first available transcript
+            transcript = transcript_list.find_transcript([language, *_FALLBACK_LANGUAGES])
+        except NoTranscriptFound:
+            # If none of those are available, get the first available transcript
             transcript = next(iter(transcript_list))
-            language = transcript.language_code
+        language = transcript.language_code
         
         # Fetch the transcript
-        transcript_data = transcript.fetch()
+        transcript_data = await call_transcript_api(transcript.fetch)
+        
+        # youtube-transcript-api 1.0 returns snippet objects instead of dicts
+        if hasattr(transcript_data, "to_raw_data"):
+            transcript_data = transcript_data.to_raw_data()
         
-        # Format transcript as plain text
-        formatter = TextFormatter()
-        text_transcript = formatter.format_transcript(transcript_data)
+        # Format transcript as plain text, one segment per line
+        text_transcript = "\n".join(segment["text"] for segment in transcript_data)
         
         return {
             "transcript": text_transcript,
@@ -120,7 +362,11 @@ async def get_video_transcript(video_id: str, language: str = 'en') -> dict:
             "error": str(e)
         }
 
-async def get_video_info(video_id: str, language: str = 'en') -> dict:
+async def get_video_info(
+    video_id: str,
+    language: str = 'en',
+    client: Optional[httpx.AsyncClient] = None
+) -> dict:
     """
     Get video information and transcript
     For video metadata, you could integrate with YouTube Data API
@@ -128,7 +374,7 @@ async def get_video_info(video_id: str, language: str = 'en') -> dict:
     """
     
     # Get transcript
-    transcript_result = await get_video_transcript(video_id, language)
+    transcript_result = await get_video_transcript(video_id, language, client)
     
     # Mock metadata (in real implementation, use YouTube Data API)
     mock_data = {
@@ -146,8 +392,60 @@ async def get_video_info(video_id: str, language: str = 'en') -> dict:
     
     return mock_data
 
-@router.post("/convert", response_model=YouTubeResponse)
-async def convert_youtube_to_text(request: YouTubeURLRequest):
+def build_video_response(video_id: str, video_data: dict) -> YouTubeResponse:
+    """Build the API response for a converted video"""
+    # The data is already trusted so skip re-validation
+    video_info = YouTubeVideoInfo.model_construct(
+        video_id=video_id,
+        title=video_data.get("title"),
+        description=video_data.get("description"),
+        duration=video_data.get("duration"),
+        view_count=video_data.get("view_count"),
+        upload_date=video_data.get("upload_date"),
+        channel_name=video_data.get("channel_name"),
+        transcript=video_data.get("transcript"),
+        transcript_language=video_data.get("transcript_language"),
+        available_languages=video_data.get("available_languages", []),
+        processed_at=datetime.now(timezone.utc)
+    )
+    
+    success_message = "Successfully converted YouTube video to text"
+    if not video_data.get("transcript_available", False):
+        success_message += " (Note: Transcript not available for this video)"
+    
+    return YouTubeResponse.model_construct(
+        success=True,
+        message=success_message,
+        data=video_info
+    )
+
+async def convert_url(
+    url: str,
+    language: str = 'en',
+    client: Optional[httpx.AsyncClient] = None
+) -> YouTubeResponse:
+    """Validate a single URL and convert it, reporting failures in the response"""
+    try:
+        request = YouTubeURLRequest(url=url, language=language)
+    except ValidationError as e:
+        return YouTubeResponse.model_construct(
+            success=False,
+            message="Invalid YouTube URL",
+            error=e.errors()[0]["msg"]
+        )
+    
+    video_data = await get_video_info(request.video_id, request.language, client)
+    return build_video_response(request.video_id, video_data)
+
+@router.post(
+    "/convert",
+    response_model=None,
+    responses={200: {"model": YouTubeResponse}}
+)
+async def convert_youtube_to_text(
+    request: YouTubeURLRequest,
+    client: httpx.AsyncClient = Depends(get_http_client)
+) -> Response:
     """
     Convert YouTube video to text information
     
@@ -156,41 +454,21 @@ async def convert_youtube_to_text(request: YouTubeURLRequest):
     - Video transcript/captions as text
     """
     try:
-        # Extract video ID
-        video_id = extract_video_id(request.url)
-        
-        if not video_id:
-            raise HTTPException(
-                status_code=400, 
-                detail="Could not extract video ID from URL"
-            )
+        # Video ID was already extracted during request validation, which
+        # rejects URLs without one
+        video_id = request.video_id
         
         # Get video information and transcript
-        video_data = await get_video_info(video_id, request.language)
+        video_data = await get_video_info(video_id, request.language, client)
         
         # Create response
-        video_info = YouTubeVideoInfo(
-            video_id=video_id,
-            title=video_data.get("title"),
-            description=video_data.get("description"),
-            duration=video_data.get("duration"),
-            view_count=video_data.get("view_count"),
-            upload_date=video_data.get("upload_date"),
-            channel_name=video_data.get("channel_name"),
-            transcript=video_data.get("transcript"),
-            transcript_language=video_data.get("transcript_language"),
-            available_languages=video_data.get("available_languages", []),
-            processed_at=datetime.utcnow()
-        )
+        response = build_video_response(video_id, video_data)
         
-        success_message = "Successfully converted YouTube video to text"
-        if not video_data.get("transcript_available", False):
-            success_message += " (Note: Transcript not available for this video)"
-        
-        return YouTubeResponse(
-            success=True,
-            message=success_message,
-            data=video_info
+        # Serialize straight to JSON bytes instead of letting FastAPI validate
+        # and encode the model again
+        return Response(
+            content=response.model_dump_json(),
+            media_type="application/json"
         )
         
     except ValueError as e:
@@ -201,21 +479,49 @@ async def convert_youtube_to_text(request: YouTubeURLRequest):
             detail=f"Error processing YouTube video: {str(e)}"
         )
 
+@router.post(
+    "/convert-batch",
+    response_model=None,
+    responses={200: {"model": YouTubeBatchResponse}}
+)
+async def convert_youtube_batch_to_text(
+    request: YouTubeBatchRequest,
+    client: httpx.AsyncClient = Depends(get_http_client)
+) -> Response:
+    """
+    Convert several YouTube videos to text in one request
+    
+    Videos are processed concurrently (still bounded by the transcript
+    concurrency cap and rate limit). Results are returned in the same order
+    as the input URLs; a failing URL doesn't fail the whole batch.
+    """
+    results = await asyncio.gather(
+        *(convert_url(url, request.language, client) for url in request.urls),
+        return_exceptions=True
+    )
+    
+    responses = [
+        YouTubeResponse.model_construct(
+            success=False,
+            message="Error processing YouTube video",
+            error=str(result)
+        ) if isinstance(result, Exception) else result
+        for result in results
+    ]
+    converted = sum(1 for response in responses if response.success)
+    
+    batch_response = YouTubeBatchResponse.model_construct(
+        success=True,
+        message=f"Converted {converted} of {len(responses)} YouTube videos to text",
+        results=responses
+    )
+    
+    return Response(
+        content=batch_response.model_dump_json(),
+        media_type="application/json"
+    )
+
 @router.get("/supported-formats")
 async def get_supported_youtube_formats():
     """Get information about supported YouTube URL formats"""
-    return {
-        "supported_formats": [
-            "https://www.youtube.com/watch?v=VIDEO_ID",
-            "https://youtube.com/watch?v=VIDEO_ID",
-            "https://youtu.be/VIDEO_ID",
-            "https://www.youtube.com/embed/VIDEO_ID",
-            "https://m.youtube.com/watch?v=VIDEO_ID"
-        ],
-        "domains": [
-            "youtube.com",
-            "www.youtube.com",
-            "youtu.be",
-            "m.youtube.com"
-        ]
-    }
\ No newline at end of file
+    return Response(content=_SUPPORTED_FORMATS_BYTES, media_type="application/json")
@@ -14,6 +14,25 @@ class Settings(BaseSettings):
         "http://localhost:8080",
     ]
     
+    # Outbound HTTP client
+    HTTP_MAX_CONNECTIONS: int = 1000
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 100
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    
+    # Transcript fetching
+    TRANSCRIPT_MAX_CONCURRENCY: int = 8
+    TRANSCRIPT_CACHE_SIZE: int = 4096
+    TRANSCRIPT_CACHE_TTL_SECONDS: int = 3600
+    TRANSCRIPT_ERROR_CACHE_TTL_SECONDS: int = 60
+    TRANSCRIPT_MAX_RETRIES: int = 3
+    
+    # Maximum number of URLs accepted by /convert-batch
+    BATCH_MAX_URLS: int = 50
+    
+    # Outbound request budget for youtube.com
+    YOUTUBE_RATE_LIMIT_PER_SECOND: int = 10
+    YOUTUBE_RATE_LIMIT_PER_MINUTE: int = 300
+    
     # Database
     DATABASE_URL: str = "sqlite:///./app.db"
     
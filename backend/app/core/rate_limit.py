@@ -0,0 +1,39 @@
+import asyncio
+import time
+from collections import deque
+from typing import Tuple
+
+
+class AsyncRateLimiter:
+    """
+    Sliding-window rate limiter for asyncio code
+    Each rate is a (max_calls, period_seconds) pair and a call only goes
+    through once every rate allows it; callers wait instead of failing
+    """
+
+    def __init__(self, *rates: Tuple[int, float]):
+        self._rates = rates
+        self._max_period = max(period for _, period in rates)
+        self._calls = deque(maxlen=max(limit for limit, _ in rates))
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+
+                # Drop calls that are outside every window
+                while self._calls and now - self._calls[0] >= self._max_period:
+                    self._calls.popleft()
+
+                # Wait until the oldest call counted against each rate expires
+                delay = 0.0
+                for limit, period in self._rates:
+                    if len(self._calls) >= limit:
+                        delay = max(delay, period - (now - self._calls[-limit]))
+
+                if delay <= 0:
+                    self._calls.append(now)
+                    return
+
+                await asyncio.sleep(delay)
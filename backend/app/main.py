@@ -1,5 +1,9 @@
+from contextlib import asynccontextmanager
+import importlib.util
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
 
@@ -9,20 +13,52 @@ from app.api.v1.api import api_router
 #     version="1.0.0"
 # )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # FastAPI builds the OpenAPI schema lazily; do it now instead of on the
+    # first docs request
+    app.openapi()
+    
+    # One pooled client for the whole app so outbound calls reuse connections.
+    # HTTP/2 lets concurrent requests to the same host share one connection;
+    # it is only enabled when h2 (httpx[http2]) is installed, since the
+    # transport doesn't check for it and would fail mid-request instead.
+    # httpx advertises br/zstd in accept-encoding by itself when the
+    # brotli/zstandard extras are installed
+    transport = httpx.AsyncHTTPTransport(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+        )
+    )
+    app.state.http = httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS)
+    )
+    try:
+        yield
+    finally:
+        await app.state.http.aclose()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],  # Frontend URL
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
     allow_headers=["*"],
 )
 
+# Transcript payloads are often tens of KB, compress anything over 1KB
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/")
@@ -33,4 +69,11 @@ async def root():
         "version": "1.0.0",
         "docs": "/docs",
         "api": settings.API_V1_STR
-    }
\ No newline at end of file
+    }
+
+# Dev entry point: `python -m app.main` from the backend directory
+# In production run e.g. `uvicorn app.main:app --loop uvloop --http httptools --workers 4`
+if __name__ == "__main__":
+    import uvicorn
+    
+    uvicorn.run("app.main:app", loop="uvloop", http="httptools", reload=settings.DEBUG)